@@ -4,16 +4,32 @@ from __future__ import annotations
 import argparse
 import re
 import sys
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 ENTRY_HEADER_RE = re.compile(r"^- \[(?P<ts>[^\]]+)\] (?P<title>.+)$")
-KV_RE = re.compile(r"^  - (?P<key>[A-Za-z0-9_]+): (?P<value>.*)$")
-
-
-@dataclass
+SLUG_INVALID_RE = re.compile(r"[^a-zA-Z0-9-]+")
+# Titles that are already slug-shaped skip the regex entirely.
+SLUG_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789-")
+KV_PREFIX = "  - "
+# Known entry keys -> Entry field names; any other key line is ignored.
+KV_FIELDS = {
+    "fingerprint": "fingerprint",
+    "source": "source",
+    "status": "status",
+    "details": "details",
+    "reviewNote": "review_note",
+}
+SAVE_BUFFER = 64 * 1024
+# Dashboard buckets, in display order.
+STATUS_BUCKETS = ("pending", "approved", "rejected", "promoted")
+
+
+@dataclass(slots=True)
 class Entry:
     header_index: int
     end_index: int
@@ -24,6 +40,9 @@ class Entry:
     status: Optional[str]
     details: Optional[str]
     review_note: Optional[str]
+    # Lazily filled API record for the dashboard. Only entries from the parse cache get one, and
+    # those are replaced wholesale when the file changes, so the memo never goes stale.
+    serialized: Optional[dict] = field(default=None, repr=False, compare=False)
 
 
 def entries_path(repo_dir: Path, source: str) -> Path:
@@ -34,105 +53,151 @@ def entries_path(repo_dir: Path, source: str) -> Path:
     raise ValueError(f"Unsupported source: {source}")
 
 
+def _new_entry_fields(header_index: int, m: re.Match) -> Dict[str, object]:
+    fields: Dict[str, object] = dict.fromkeys(KV_FIELDS.values())
+    fields.update(header_index=header_index, timestamp=m.group("ts"), title=m.group("title"))
+    return fields
+
+
 def parse_entries(lines: List[str]) -> List[Entry]:
     entries: List[Entry] = []
-    i = 0
-    while i < len(lines):
-        m = ENTRY_HEADER_RE.match(lines[i])
-        if not m:
-            i += 1
+    fields: Optional[Dict[str, object]] = None
+
+    # Single pass: cheap prefix checks classify each line; only header candidates hit the regex.
+    for idx, line in enumerate(lines):
+        if line.startswith("- ["):
+            m = ENTRY_HEADER_RE.match(line)
+            if m:
+                if fields is not None:
+                    entries.append(Entry(end_index=idx, **fields))
+                fields = _new_entry_fields(idx, m)
             continue
 
-        header_index = i
-        j = i + 1
-        while j < len(lines) and not ENTRY_HEADER_RE.match(lines[j]):
-            j += 1
-
-        fingerprint = None
-        source = None
-        status = None
-        details = None
-        review_note = None
-
-        for k in range(i + 1, j):
-            km = KV_RE.match(lines[k])
-            if not km:
-                continue
-            key = km.group("key")
-            value = km.group("value")
-            if key == "fingerprint":
-                fingerprint = value
-            elif key == "source":
-                source = value
-            elif key == "status":
-                status = value
-            elif key == "details":
-                details = value
-            elif key == "reviewNote":
-                review_note = value
-
-        entries.append(
-            Entry(
-                header_index=header_index,
-                end_index=j,
-                timestamp=m.group("ts"),
-                title=m.group("title"),
-                fingerprint=fingerprint,
-                source=source,
-                status=status,
-                details=details,
-                review_note=review_note,
-            )
-        )
-        i = j
+        if fields is None or not line.startswith(KV_PREFIX):
+            continue
+        key, sep, value = line[len(KV_PREFIX):].partition(": ")
+        attr = KV_FIELDS.get(key) if sep else None
+        if attr is not None:
+            fields[attr] = value
 
+    if fields is not None:
+        entries.append(Entry(end_index=len(lines), **fields))
     return entries
 
 
 def load_lines(path: Path) -> List[str]:
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
-    return path.read_text(encoding="utf-8").splitlines()
+    # Decode the raw bytes once; splitlines() already handles \r\n, so no newline translation is needed.
+    return path.read_bytes().decode("utf-8").splitlines()
 
 
-def save_lines(path: Path, lines: List[str]) -> None:
-    path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+# path -> (st_mtime_ns, st_size, entries, fingerprint index). A rewrite changes the stat
+# signature; save_lines also drops the entry and bumps _SAVE_GENERATION in case mtime
+# resolution is too coarse to tell the versions apart.
+_PARSE_CACHE: Dict[Path, Tuple[int, int, List[Entry], Dict[str, Entry]]] = {}
+_PARSE_LOCK = threading.Lock()
+_SAVE_GENERATION = 0
+
 
+def save_generation() -> int:
+    # Process-local count of save_lines calls; lets stat-based cache keys survive coarse mtimes.
+    return _SAVE_GENERATION
 
-def find_entry_by_fingerprint(entries: List[Entry], fingerprint: str) -> Entry:
+
+def get_cached_entries(path: Path) -> Tuple[List[Entry], Dict[str, Entry]]:
+    generation = _SAVE_GENERATION
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Missing file: {path}") from None
+    cached = _PARSE_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2], cached[3]
+
+    entries = parse_entries(load_lines(path))
+    index = build_fingerprint_index(entries)
+    with _PARSE_LOCK:
+        # A save that landed while we were reading may share our stat; don't cache what we read.
+        if generation == _SAVE_GENERATION:
+            _PARSE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, entries, index)
+    return entries, index
+
+
+def save_lines(path: Path, lines: List[str]) -> None:
+    # Stream the lines instead of joining the whole file into one string. Trailing blank
+    # lines are dropped and the file ends with exactly one newline, as before.
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    with path.open("w", encoding="utf-8", buffering=SAVE_BUFFER) as handle:
+        if end:
+            handle.writelines(f"{line}\n" for line in islice(lines, end - 1))
+            handle.write(lines[end - 1].rstrip())
+        handle.write("\n")
+    global _SAVE_GENERATION
+    with _PARSE_LOCK:
+        _SAVE_GENERATION += 1
+        _PARSE_CACHE.pop(path, None)
+
+
+def build_fingerprint_index(entries: List[Entry]) -> Dict[str, Entry]:
+    index: Dict[str, Entry] = {}
     for entry in entries:
-        if entry.fingerprint == fingerprint:
-            return entry
-    raise ValueError(f"Fingerprint not found: {fingerprint}")
+        if entry.fingerprint is None:
+            continue
+        # Keep the first occurrence so duplicate fingerprints resolve like a top-down scan.
+        index.setdefault(entry.fingerprint, entry)
+    return index
+
 
+def find_entry_by_fingerprint(index: Dict[str, Entry], fingerprint: str) -> Entry:
+    entry = index.get(fingerprint)
+    if entry is None:
+        raise ValueError(f"Fingerprint not found: {fingerprint}")
+    return entry
 
-def update_or_insert_kv(lines: List[str], entry: Entry, key: str, value: str) -> None:
-    target = f"  - {key}: "
+
+def update_or_insert_kvs(lines: List[str], entry: Entry, updates: Dict[str, str]) -> int:
+    # Existing keys are rewritten in place; missing ones are spliced in together at the end of
+    # the entry, in the order given (status before reviewNote), so the tail of the file moves
+    # once per call. Returns the number of inserted lines; entry.end_index is bumped to match,
+    # later entries are not shifted.
+    pending = {f"{KV_PREFIX}{key}: ": value for key, value in updates.items()}
     for i in range(entry.header_index + 1, entry.end_index):
-        if lines[i].startswith(target):
-            lines[i] = f"{target}{value}"
-            return
+        for target in pending:
+            if lines[i].startswith(target):
+                lines[i] = f"{target}{pending.pop(target)}"
+                break
+        if not pending:
+            return 0
 
-    insert_at = entry.end_index
-    lines.insert(insert_at, f"{target}{value}")
+    lines[entry.end_index:entry.end_index] = [f"{target}{value}" for target, value in pending.items()]
+    entry.end_index += len(pending)
+    return len(pending)
 
 
 def cmd_review(repo_dir: Path, source: str, fingerprint: str, status: str, reason: str) -> None:
     path = entries_path(repo_dir, source)
     lines = load_lines(path)
-    entries = parse_entries(lines)
-    entry = find_entry_by_fingerprint(entries, fingerprint)
+    index = build_fingerprint_index(parse_entries(lines))
+    entry = find_entry_by_fingerprint(index, fingerprint)
 
-    update_or_insert_kv(lines, entry, "status", status)
+    updates = {"status": status}
     if reason.strip():
-        update_or_insert_kv(lines, entry, "reviewNote", reason.strip())
+        updates["reviewNote"] = reason.strip()
+    update_or_insert_kvs(lines, entry, updates)
 
     save_lines(path, lines)
     print(f"Updated {source} learning {fingerprint} -> status={status}")
 
 
 def safe_slug(value: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9-]+", "-", value.strip()).strip("-").lower()
+    stripped = value.strip()
+    if SLUG_CHARS.issuperset(stripped):
+        slug = stripped.strip("-")
+    else:
+        slug = SLUG_INVALID_RE.sub("-", stripped).strip("-").lower()
     if not slug:
         raise ValueError("Invalid slug.")
     return slug
@@ -203,8 +268,8 @@ def cmd_promote(
 ) -> None:
     entries_file = entries_path(repo_dir, source)
     lines = load_lines(entries_file)
-    entries = parse_entries(lines)
-    entry = find_entry_by_fingerprint(entries, fingerprint)
+    index = build_fingerprint_index(parse_entries(lines))
+    entry = find_entry_by_fingerprint(index, fingerprint)
 
     if entry.status not in {"approved", "promoted"}:
         raise ValueError(
@@ -229,12 +294,11 @@ def cmd_promote(
         fingerprint=fingerprint,
     )
 
-    # Re-parse because insertion positions may have shifted due to edits.
-    lines = load_lines(entries_file)
-    entries = parse_entries(lines)
-    entry = find_entry_by_fingerprint(entries, fingerprint)
-    update_or_insert_kv(lines, entry, "status", "promoted")
-    update_or_insert_kv(lines, entry, "reviewNote", f"Promoted to {destination_file.relative_to(repo_dir)}")
+    update_or_insert_kvs(
+        lines,
+        entry,
+        {"status": "promoted", "reviewNote": f"Promoted to {destination_file.relative_to(repo_dir)}"},
+    )
     save_lines(entries_file, lines)
 
     print(f"Promoted learning to {destination_file.relative_to(repo_dir)}")
@@ -249,8 +313,8 @@ def cmd_promote_into_existing(
 ) -> None:
     entries_file = entries_path(repo_dir, source)
     lines = load_lines(entries_file)
-    entries = parse_entries(lines)
-    entry = find_entry_by_fingerprint(entries, fingerprint)
+    index = build_fingerprint_index(parse_entries(lines))
+    entry = find_entry_by_fingerprint(index, fingerprint)
 
     if entry.status not in {"approved", "promoted"}:
         raise ValueError(
@@ -271,11 +335,11 @@ def cmd_promote_into_existing(
         fingerprint=fingerprint,
     )
 
-    lines = load_lines(entries_file)
-    entries = parse_entries(lines)
-    entry = find_entry_by_fingerprint(entries, fingerprint)
-    update_or_insert_kv(lines, entry, "status", "promoted")
-    update_or_insert_kv(lines, entry, "reviewNote", f"Promoted into {destination_file.relative_to(repo_dir)}")
+    update_or_insert_kvs(
+        lines,
+        entry,
+        {"status": "promoted", "reviewNote": f"Promoted into {destination_file.relative_to(repo_dir)}"},
+    )
     save_lines(entries_file, lines)
 
     print(f"Promoted learning into {destination_file.relative_to(repo_dir)}")
@@ -289,17 +353,17 @@ def cmd_dashboard(repo_dir: Path, limit: int) -> None:
     generated_entries = parse_entries(load_lines(generated_file))
 
     all_entries = [("manual", e) for e in manual_entries] + [("generated", e) for e in generated_entries]
-    pending = [(src, e) for src, e in all_entries if (e.status or "").strip() == "pending"]
-    approved = [(src, e) for src, e in all_entries if (e.status or "").strip() == "approved"]
-    rejected = [(src, e) for src, e in all_entries if (e.status or "").strip() == "rejected"]
-    promoted = [(src, e) for src, e in all_entries if (e.status or "").strip() == "promoted"]
+    buckets: Dict[str, List[Tuple[str, Entry]]] = {status: [] for status in STATUS_BUCKETS}
+    for src, e in all_entries:
+        bucket = buckets.get((e.status or "").strip())
+        if bucket is not None:
+            bucket.append((src, e))
+    pending = buckets["pending"]
 
     print("Learning Dashboard")
     print("==================")
-    print(f"pending:  {len(pending)}")
-    print(f"approved: {len(approved)}")
-    print(f"rejected: {len(rejected)}")
-    print(f"promoted: {len(promoted)}")
+    for status, bucket in buckets.items():
+        print(f"{status + ':':<9} {len(bucket)}")
     print("")
 
     print(f"Top pending (limit {limit})")
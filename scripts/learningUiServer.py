@@ -2,34 +2,73 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import json
+import os
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 import re
+import socket
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
+from functools import lru_cache
+from itertools import islice
+from typing import BinaryIO, Iterator
 from urllib.parse import parse_qs, urlparse
 
-from learningManager import cmd_promote, cmd_promote_into_existing, cmd_review, entries_path, load_lines, parse_entries
+try:
+    import orjson
+except ImportError:  # optional: faster, compact JSON encoding when installed
+    orjson = None
 
-
-FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n", re.DOTALL)
-NAME_RE = re.compile(r"^name:\s*(.+)$", re.MULTILINE)
-DESCRIPTION_RE = re.compile(r"^description:\s*(.+)$", re.MULTILINE)
+from learningManager import (
+    STATUS_BUCKETS,
+    cmd_promote,
+    cmd_promote_into_existing,
+    cmd_review,
+    entries_path,
+    get_cached_entries,
+    save_generation,
+)
 
 
-def build_dashboard(repo_dir: Path, limit: int) -> dict:
-    manual_entries = parse_entries(load_lines(entries_path(repo_dir, "manual")))
-    generated_entries = parse_entries(load_lines(entries_path(repo_dir, "generated")))
+FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n", re.DOTALL)
+FRONTMATTER_FIELD_RE = re.compile(r"^(?P<key>name|description):\s*(?P<value>.+)$", re.MULTILINE)
+# Frontmatter sits at the top of SKILL.md, so a small head read is usually enough.
+FRONTMATTER_READ_SIZE = 2048
+LOG_TAIL_WINDOW = 64 * 1024
+LOG_WRITE_BUFFER = 64 * 1024
+SERVER_WORKERS = 8
+# A connection gets a short window to send its request line, then the normal timeout.
+REQUEST_LINE_TIMEOUT = 1
+HANDLER_TIMEOUT = 10
+LOG_RING_SIZE = 10_000
+
+# Append handles stay open for the server's lifetime; requests are served from many threads.
+_LOG_HANDLES: dict[Path, BinaryIO] = {}
+_LOG_LOCK = threading.Lock()
+_LOG_RINGS: dict[Path, deque[dict]] = {}
+# SKILL.md path -> (st_mtime_ns, content) for /api/skill.
+_SKILL_FILE_CACHE: dict[Path, tuple[int, str]] = {}
+
+
+def build_dashboard(repo_dir: Path, limit: int, include_all: bool = False) -> dict:
+    manual_entries, _ = get_cached_entries(entries_path(repo_dir, "manual"))
+    generated_entries, _ = get_cached_entries(entries_path(repo_dir, "generated"))
 
     all_entries = [{"source": "manual", "entry": e} for e in manual_entries] + [
         {"source": "generated", "entry": e} for e in generated_entries
     ]
 
-    pending = [x for x in all_entries if (x["entry"].status or "").strip() == "pending"]
-    approved = [x for x in all_entries if (x["entry"].status or "").strip() == "approved"]
-    rejected = [x for x in all_entries if (x["entry"].status or "").strip() == "rejected"]
-    promoted = [x for x in all_entries if (x["entry"].status or "").strip() == "promoted"]
+    buckets: dict[str, list[dict]] = {status: [] for status in STATUS_BUCKETS}
+    for x in all_entries:
+        bucket = buckets.get((x["entry"].status or "").strip())
+        if bucket is not None:
+            bucket.append(x)
+    pending = buckets["pending"]
 
     def suggest_promotion(entry) -> dict:
         title = (entry.title or "").lower()
@@ -57,50 +96,102 @@ def build_dashboard(repo_dir: Path, limit: int) -> dict:
 
         return {"mode": "existing", "skillSlug": "master-engineering-standards", "target": "skills"}
 
-    def serialize(items: list[dict], item_limit: int | None = None) -> list[dict]:
-        records = items if item_limit is None else items[:item_limit]
-        return [
-            {
+    def serialize_one(x: dict) -> dict:
+        # Entries come from the stat-keyed parse cache, so the record is built once per file version.
+        entry = x["entry"]
+        if entry.serialized is None:
+            entry.serialized = {
                 "source": x["source"],
-                "timestamp": x["entry"].timestamp,
-                "title": x["entry"].title,
-                "fingerprint": x["entry"].fingerprint,
-                "status": x["entry"].status,
-                "details": x["entry"].details,
-                "reviewNote": x["entry"].review_note,
-                "promotionSuggestion": suggest_promotion(x["entry"]),
+                "timestamp": entry.timestamp,
+                "title": entry.title,
+                "fingerprint": entry.fingerprint,
+                "status": entry.status,
+                "details": entry.details,
+                "reviewNote": entry.review_note,
+                "promotionSuggestion": suggest_promotion(entry),
             }
-            for x in records
-        ]
+        return entry.serialized
+
+    def serialize(items: list[dict], item_limit: int | None = None) -> list[dict]:
+        records = items if item_limit is None else items[:item_limit]
+        return [serialize_one(x) for x in records]
 
     return {
-        "counts": {
-            "pending": len(pending),
-            "approved": len(approved),
-            "rejected": len(rejected),
-            "promoted": len(promoted),
-        },
+        "counts": {status: len(bucket) for status, bucket in buckets.items()},
         "pending": serialize(pending, limit),
-        "all": serialize(all_entries),
+        "all": serialize(all_entries) if include_all else None,
     }
 
 
+def dashboard_etag(repo_dir: Path) -> str | None:
+    # The dashboard is derived only from the two entries files, so their stat signature
+    # identifies the response for a given URL. The save generation covers same-size rewrites
+    # that land within one mtime tick.
+    parts: list[str] = [f"{save_generation():x}"]
+    for source in ("manual", "generated"):
+        try:
+            stat = entries_path(repo_dir, source).stat()
+        except OSError:
+            return None
+        parts.append(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+    return f'"{".".join(parts)}"'
+
+
+def encode_json(payload: dict) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except orjson.JSONEncodeError:
+            # orjson rejects lone surrogates (e.g. from logged client input); the stdlib escapes them.
+            pass
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
+
+
 def parse_skill_frontmatter(skill_text: str) -> dict:
     front = {"name": "", "description": ""}
     match = FRONTMATTER_RE.search(skill_text)
     if not match:
         return front
 
-    block = match.group(1)
-    name_match = NAME_RE.search(block)
-    desc_match = DESCRIPTION_RE.search(block)
-    if name_match:
-        front["name"] = name_match.group(1).strip()
-    if desc_match:
-        front["description"] = desc_match.group(1).strip()
+    seen: set[str] = set()
+    for field in FRONTMATTER_FIELD_RE.finditer(match.group(1)):
+        key = field.group("key")
+        if key in seen:
+            continue
+        seen.add(key)
+        front[key] = field.group("value").strip()
+        if len(seen) == 2:
+            break
     return front
 
 
+@lru_cache(maxsize=1024)
+def read_skill_frontmatter(skill_file: Path, mtime_ns: int) -> dict:
+    # mtime_ns is only part of the cache key, so edited files are re-read on the next call.
+    with skill_file.open("r", encoding="utf-8", errors="replace") as handle:
+        text = handle.read(FRONTMATTER_READ_SIZE)
+        if text.startswith("---\n") and "\n---\n" not in text:
+            text += handle.read()
+    return parse_skill_frontmatter(text)
+
+
+def scan_skill_files(root: Path) -> Iterator[tuple[Path, int]]:
+    # os.scandir hands back file types from the directory listing, so only SKILL.md files are
+    # stat'ed. Symlinked directories are not followed, matching Path.rglob.
+    pending = [root]
+    while pending:
+        try:
+            listing = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with listing:
+            for entry in listing:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.name == "SKILL.md" and entry.is_file():
+                    yield Path(entry.path), entry.stat().st_mtime_ns
+
+
 def build_skills(repo_dir: Path) -> dict:
     roots = [
         ("skills", repo_dir / "skills"),
@@ -113,9 +204,8 @@ def build_skills(repo_dir: Path) -> dict:
     for source, root in roots:
         if not root.exists():
             continue
-        for skill_file in sorted(root.rglob("SKILL.md")):
-            text = skill_file.read_text(encoding="utf-8", errors="replace")
-            front = parse_skill_frontmatter(text)
+        for skill_file, mtime_ns in sorted(scan_skill_files(root), key=lambda item: item[0].parts):
+            front = read_skill_frontmatter(skill_file, mtime_ns)
             rel = skill_file.relative_to(repo_dir).as_posix()
             skills.append(
                 {
@@ -137,10 +227,52 @@ def logs_file_path(repo_dir: Path) -> Path:
 
 
 def read_logs(repo_dir: Path, limit: int) -> list[dict]:
-    path = logs_file_path(repo_dir)
-    if not path.exists():
-        return []
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    # Served from the in-memory ring, which holds the newest LOG_RING_SIZE records. The ring is
+    # loaded from disk once and then only follows append_log, so edits or truncation of
+    # action-logs.jsonl made outside the server show up only after a restart.
+    with _LOG_LOCK:
+        ring = _log_ring(logs_file_path(repo_dir))
+        if limit > 0:
+            return list(islice(reversed(ring), limit))
+        records = list(ring)
+    return list(reversed(records[-limit:]))
+
+
+def preload_logs(repo_dir: Path) -> None:
+    with _LOG_LOCK:
+        _log_ring(logs_file_path(repo_dir))
+
+
+def _log_ring(path: Path) -> deque[dict]:
+    # Caller must hold _LOG_LOCK. The file is only read the first time a path is seen.
+    ring = _LOG_RINGS.get(path)
+    if ring is None:
+        records = tail_log_records(path, LOG_RING_SIZE) if path.exists() else []
+        ring = deque(records, maxlen=LOG_RING_SIZE)
+        _LOG_RINGS[path] = ring
+    return ring
+
+
+def tail_log_records(path: Path, limit: int) -> list[dict]:
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        # Only the newest records are returned, so read a tail window and widen it until it
+        # holds enough complete lines. limit <= 0 keeps the old slice semantics (whole file).
+        window = LOG_TAIL_WINDOW if limit > 0 else size
+        while True:
+            start = max(0, size - window)
+            handle.seek(start)
+            lines = handle.read(size - start).decode("utf-8", errors="replace").splitlines()
+            if start > 0 and lines:
+                lines = lines[1:]  # first line may be cut mid-record
+            records = parse_log_lines(lines)
+            if start == 0 or len(records) >= limit:
+                break
+            window *= 2
+    return records[-limit:]
+
+
+def parse_log_lines(lines: list[str]) -> list[dict]:
     records: list[dict] = []
     for line in lines:
         if not line.strip():
@@ -149,7 +281,7 @@ def read_logs(repo_dir: Path, limit: int) -> list[dict]:
             records.append(json.loads(line))
         except json.JSONDecodeError:
             continue
-    return list(reversed(records[-limit:]))
+    return records
 
 
 def append_log(repo_dir: Path, payload: dict) -> None:
@@ -164,41 +296,97 @@ def append_log(repo_dir: Path, payload: dict) -> None:
         "reason": payload.get("reason", ""),
         "skillPath": payload.get("skillPath", ""),
     }
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(record, ensure_ascii=True) + "\n")
+    line = json.dumps(record, ensure_ascii=True).encode("utf-8") + b"\n"
+    with _LOG_LOCK:
+        # Load the ring before writing so the new record is not picked up from disk as well.
+        ring = _log_ring(path)
+        handle = _LOG_HANDLES.get(path)
+        if handle is None:
+            handle = path.open("ab", buffering=LOG_WRITE_BUFFER)
+            _LOG_HANDLES[path] = handle
+        handle.write(line)
+        # Flush per record so the file stays the durable copy; keeping the handle open still
+        # saves the open/close pair on every event.
+        handle.flush()
+        ring.append(record)
+
+
+def close_log_handles() -> None:
+    with _LOG_LOCK:
+        for handle in _LOG_HANDLES.values():
+            handle.close()
+        _LOG_HANDLES.clear()
+
+
+atexit.register(close_log_handles)
 
 
 def read_skill_file(repo_dir: Path, rel_path: str) -> dict:
-    candidate = (repo_dir / rel_path).resolve()
-    if repo_dir.resolve() not in candidate.parents and candidate != repo_dir.resolve():
+    # Lexical checks reject traversal without touching the filesystem; repo_dir is already resolved.
+    norm = os.path.normpath(rel_path)
+    if os.path.isabs(norm) or norm == os.pardir or norm.startswith(os.pardir + os.sep):
         raise ValueError("Invalid path.")
+    candidate = repo_dir / norm
     if candidate.name != "SKILL.md":
         raise ValueError("Only SKILL.md paths are allowed.")
-    if not candidate.exists():
-        raise FileNotFoundError(f"Skill file not found: {rel_path}")
-    content = candidate.read_text(encoding="utf-8", errors="replace")
-    return {"path": rel_path, "content": content}
+    try:
+        mtime_ns = candidate.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Skill file not found: {rel_path}") from None
+
+    cached = _SKILL_FILE_CACHE.get(candidate)
+    if cached is None or cached[0] != mtime_ns:
+        # Resolve only on a cache miss, to catch symlinks that lead outside the repo.
+        resolved = candidate.resolve()
+        if repo_dir not in resolved.parents or resolved.name != "SKILL.md":
+            raise ValueError("Invalid path.")
+        cached = (mtime_ns, candidate.read_text(encoding="utf-8", errors="replace"))
+        _SKILL_FILE_CACHE[candidate] = cached
+    return {"path": rel_path, "content": cached[1]}
+
+
+@lru_cache(maxsize=64)
+def load_static_asset(file_path: Path, mtime_ns: int) -> tuple[str, bytes, str]:
+    # mtime_ns is only part of the cache key, so edited assets are picked up without a restart.
+    suffix = file_path.suffix.lower()
+    ctype = "text/css" if suffix == ".css" else "application/javascript"
+    body = file_path.read_bytes()
+    return f"{ctype}; charset=utf-8", body, str(len(body))
 
 
 class LearningUiHandler(BaseHTTPRequestHandler):
+    # Applied by StreamRequestHandler.setup(); idle (e.g. preconnect) sockets release their thread
+    # after REQUEST_LINE_TIMEOUT, and parse_request() widens it once a request has arrived.
+    timeout = REQUEST_LINE_TIMEOUT
     repo_dir: Path
     html_path: Path
-
-    def _send_json(self, payload: dict, status: int = HTTPStatus.OK) -> None:
-        body = json.dumps(payload).encode("utf-8")
+    html_bytes: bytes
+    html_length: str
+
+    def parse_request(self) -> bool:
+        self.connection.settimeout(HANDLER_TIMEOUT)
+        return super().parse_request()
+
+    def _send_bytes(
+        self,
+        body: bytes,
+        ctype: str,
+        length: str | None = None,
+        status: int = HTTPStatus.OK,
+        etag: str | None = None,
+    ) -> None:
+        # Cached bodies pass their precomputed Content-Length so hot routes only write.
         self.send_response(status)
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", length or str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
         self.end_headers()
         self.wfile.write(body)
 
-    def _send_html(self, html_text: str) -> None:
-        body = html_text.encode("utf-8")
-        self.send_response(HTTPStatus.OK)
-        self.send_header("Content-Type", "text/html; charset=utf-8")
-        self.send_header("Content-Length", str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+    def _send_json(self, payload: dict, status: int = HTTPStatus.OK, etag: str | None = None) -> None:
+        self._send_bytes(encode_json(payload), "application/json; charset=utf-8", status=status, etag=etag)
 
     def _read_json(self) -> dict:
         length = int(self.headers.get("Content-Length", "0"))
@@ -208,14 +396,21 @@ class LearningUiHandler(BaseHTTPRequestHandler):
     def do_GET(self) -> None:  # noqa: N802
         parsed = urlparse(self.path)
         if parsed.path in {"/", "/index.html", "/learning-dashboard.html"}:
-            self._send_html(self.html_path.read_text(encoding="utf-8"))
+            self._send_bytes(self.html_bytes, "text/html; charset=utf-8", self.html_length)
             return
 
         if parsed.path == "/api/dashboard":
             qs = parse_qs(parsed.query)
             limit = int(qs.get("limit", ["20"])[0])
-            data = build_dashboard(self.repo_dir, limit)
-            self._send_json({"ok": True, "data": data})
+            include_all = qs.get("include_all", ["0"])[0] == "1"
+            etag = dashboard_etag(self.repo_dir)
+            if etag and self.headers.get("If-None-Match") == etag:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            data = build_dashboard(self.repo_dir, limit, include_all=include_all)
+            self._send_json({"ok": True, "data": data}, etag=etag)
             return
         if parsed.path == "/api/skills":
             data = build_skills(self.repo_dir)
@@ -243,14 +438,8 @@ class LearningUiHandler(BaseHTTPRequestHandler):
             except ValueError:
                 file_path = None
             if file_path and file_path.is_file():
-                suffix = file_path.suffix.lower()
-                ctype = "text/css" if suffix == ".css" else "application/javascript"
-                body = file_path.read_bytes()
-                self.send_response(HTTPStatus.OK)
-                self.send_header("Content-Type", f"{ctype}; charset=utf-8")
-                self.send_header("Content-Length", str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
+                ctype, body, length = load_static_asset(file_path, file_path.stat().st_mtime_ns)
+                self._send_bytes(body, ctype, length)
                 return
 
         self._send_json({"ok": False, "error": "Not found"}, status=HTTPStatus.NOT_FOUND)
@@ -305,6 +494,55 @@ class LearningUiHandler(BaseHTTPRequestHandler):
         return
 
 
+class PooledHTTPServer(ThreadingHTTPServer):
+    # Hand requests to a fixed worker pool instead of starting a thread per request. When every
+    # worker is busy the request spills to a fresh thread, as ThreadingHTTPServer would do, so
+    # slow or idle connections never queue other requests behind them.
+    def __init__(self, server_address, handler_class, max_workers: int = SERVER_WORKERS) -> None:
+        # Set up before binding: TCPServer.__init__ calls server_close() if the bind fails.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="learning-ui")
+        self._max_workers = max_workers
+        self._busy_workers = 0
+        self._open_requests: set[socket.socket] = set()
+        self._open_lock = threading.Lock()
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address) -> None:
+        with self._open_lock:
+            self._open_requests.add(request)
+            pooled = self._busy_workers < self._max_workers
+            if pooled:
+                self._busy_workers += 1
+        if pooled:
+            self._executor.submit(self._process_tracked, request, client_address, True)
+        else:
+            threading.Thread(
+                target=self._process_tracked, args=(request, client_address, False), daemon=True
+            ).start()
+
+    def _process_tracked(self, request, client_address, pooled: bool) -> None:
+        try:
+            self.process_request_thread(request, client_address)
+        finally:
+            with self._open_lock:
+                self._open_requests.discard(request)
+                if pooled:
+                    self._busy_workers -= 1
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Shut down open connections so workers blocked on idle sockets return now instead of
+        # after the handler timeout, and drop requests still queued for a worker.
+        with self._open_lock:
+            open_requests = list(self._open_requests)
+        for request in open_requests:
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Serve local learning dashboard UI.")
     parser.add_argument("--repo-dir", default=".", help="Repository root path")
@@ -318,8 +556,11 @@ def main() -> int:
 
     LearningUiHandler.repo_dir = repo_dir
     LearningUiHandler.html_path = html_path
+    LearningUiHandler.html_bytes = html_path.read_bytes()
+    LearningUiHandler.html_length = str(len(LearningUiHandler.html_bytes))
+    preload_logs(repo_dir)
 
-    server = ThreadingHTTPServer(("127.0.0.1", args.port), LearningUiHandler)
+    server = PooledHTTPServer(("127.0.0.1", args.port), LearningUiHandler)
     print(f"Learning UI running at http://127.0.0.1:{args.port}")
     print("Press Ctrl+C to stop.")
     try:
@@ -11,7 +11,7 @@ import { renderLogs } from "./components/logs.js";
 export async function loadData() {
   setMessage("");
   const [dashboardRes, skillsRes, logsRes] = await Promise.all([
-    fetch("/api/dashboard?limit=800"),
+    fetch("/api/dashboard?limit=800&include_all=1"),
     fetch("/api/skills"),
     fetch("/api/logs?limit=200"),
   ]);